@@ -28,6 +28,7 @@
 
 # WMO Core Metadata Profile Key Performance Indicators (KPIs)
 
+from concurrent.futures import as_completed, ProcessPoolExecutor
 import json
 import logging
 
@@ -100,4 +101,72 @@ def validate(ctx, file_or_url, summary, kpi, logfile, verbosity,
         click.echo(json.dumps(kpis_results['summary'], indent=4))
 
 
+@click.command()
+@click.pass_context
+@get_cli_common_options
+@click.argument('files', nargs=-1, required=True,
+                type=click.Path(exists=True, dir_okay=False))
+@click.option('--fail-on-ets/--no-fail-on-ets',
+              '-f', default=True, help='Stop the KPI on failing ETS')
+@click.option('--summary', '-s', is_flag=True, default=False,
+              help='Provide summary of KPI test results')
+@click.option('--workers', '-w', type=int, default=None,
+              help='Number of worker processes (default is number of CPUs)')
+def validate_batch(ctx, files, summary, workers, logfile, verbosity,
+                   fail_on_ets=True):
+    """run key performance indicators against multiple files"""
+
+    setup_logger(verbosity, logfile)
+
+    results = {}
+    errors = 0
+
+    click.echo(f'Validating {len(files)} files')
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(evaluate_file, file_, fail_on_ets): file_
+            for file_ in files
+        }
+
+        for future in as_completed(futures):
+            file_ = futures[future]
+            try:
+                kpis_results = future.result()
+            except Exception as err:
+                LOGGER.error('%s: %s', file_, err)
+                results[file_] = {'error': str(err)}
+                errors += 1
+                continue
+
+            if summary:
+                results[file_] = kpis_results['summary']
+            else:
+                results[file_] = kpis_results
+
+    click.echo(json.dumps({f: results[f] for f in files}, indent=4))
+    ctx.exit(1 if errors else 0)
+
+
+def evaluate_file(filename: str, fail_on_ets: bool = True) -> dict:
+    """
+    Helper function to run key performance indicators against a file
+
+    :param filename: path to WCMP2 file
+    :param fail_on_ets: whether to stop the KPI on failing ETS
+
+    :returns: `dict` of KPI results
+    """
+
+    with open(filename) as fh:
+        data = parse_wcmp(fh.read())
+
+    if fail_on_ets:
+        ts = WMOCoreMetadataProfileTestSuite2(data)
+        _ = ts.run_tests(fail_on_schema_validation=True)
+
+    return wcmp_kpis2(data).evaluate()
+
+
 kpi.add_command(validate)
+kpi.add_command(validate_batch)
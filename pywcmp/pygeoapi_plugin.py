@@ -46,6 +46,11 @@
 #     processor:
 #         name: pywcmp.pygeoapi_plugin.WCMP2KPIProcessor
 #
+# pywcmp-wis2-wcmp2-ets-kpi:
+#     type: process
+#     processor:
+#         name: pywcmp.pygeoapi_plugin.WCMP2ETSKPIProcessor
+#
 # 3. (re)start pygeoapi
 #
 # The resulting processes will be available at the following endpoints:
@@ -54,20 +59,35 @@
 #
 # /processes/pywcmp-wis2-wcmp2-kpi
 #
+# /processes/pywcmp-wis2-wcmp2-ets-kpi
+#
 # Note that pygeoapi's OpenAPI/Swagger interface (at /openapi) will also
 # provide a developer-friendly interface to test and run requests
 #
 
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+import json
 import logging
+import threading
+import uuid
 
 from pygeoapi.process.base import BaseProcessor, ProcessorExecuteError
 
-from pywcmp.wcmp2.ets import WMOCoreMetadataProfileTestSuite2
+from pywcmp.util import get_current_datetime_rfc3339, parse_wcmp
+from pywcmp.wcmp2.ets import get_validator, WMOCoreMetadataProfileTestSuite2
 from pywcmp.wcmp2.kpi import WMOCoreMetadataProfileKeyPerformanceIndicators
 
 LOGGER = logging.getLogger(__name__)
 
+# ETS reports, by normalized record content, for repeated validations
+# (KPI results depend on live link checks, so only the ETS is cached)
+ETS_CACHE = OrderedDict()
+ETS_CACHE_LOCK = threading.Lock()
+ETS_CACHE_SIZE = 256
+
 PROCESS_WCMP2_ETS = {
     'version': '0.1.0',
     'id': 'pywcmp-wis2-wcmp2-ets',
@@ -180,6 +200,144 @@ PROCESS_WCMP2_KPI = {
     }
 }
 
+PROCESS_WCMP2_ETS_KPI = {
+    'version': '0.1.0',
+    'id': 'pywcmp-wis2-wcmp2-ets-kpi',
+    'title': {
+        'en': 'WCMP2 ETS validator and KPI evaluator'
+    },
+    'description': {
+        'en': 'Validate a WCMP2 document against the ETS and KPI suite'
+    },
+    'keywords': ['wis2', 'wcmp2', 'ets', 'kpi', 'test suite', 'metadata'],
+    'links': [{
+        'type': 'text/html',
+        'rel': 'about',
+        'title': 'information',
+        'href': 'https://wmo-im.github.io/wcmp2',
+        'hreflang': 'en-US'
+    }],
+    'inputs': {
+        'record': {
+            'title': 'WCMP2 record',
+            'description': 'WCMP2 record',
+            'schema': {
+                'type': 'string'
+            },
+            'minOccurs': 1,
+            'maxOccurs': 1,
+            'metadata': None,
+            'keywords': ['wcmp2']
+        },
+        'fail_on_schema_validation': {
+            'title': 'Fail on schema validation',
+            'description': 'Stop the ETS on failing schema validation',
+            'schema': {
+                'type': 'boolean',
+                'default': True
+            },
+            'minOccurs': 0,
+            'maxOccurs': 1,
+            'metadata': None,
+            'keywords': ['schema', 'validation']
+        }
+    },
+    'outputs': {
+        'result': {
+            'title': 'Report of ETS and KPI results',
+            'description': 'Report of ETS and KPI results',
+            'schema': {
+                'type': 'object',
+                'contentMediaType': 'application/json'
+            }
+        }
+    },
+    'example': {
+        'inputs': {
+            'record': {
+                '$ref': 'https://raw.githubusercontent.com/wmo-im/pywcmp/master/tests/data/wcmp2-passing.json'  # noqa
+            },
+            'fail_on_schema_validation': True
+        }
+    }
+}
+
+
+def load_record(record) -> dict:
+    """
+    Helper function to load a WCMP2 record input, parsing it once if needed
+
+    :param record: `dict` or `str` of WCMP2 record
+
+    :returns: `dict` of WCMP2 record
+    """
+
+    if isinstance(record, dict):
+        return record
+
+    LOGGER.debug('Parsing record')
+    try:
+        return parse_wcmp(record)
+    except RuntimeError as err:
+        LOGGER.error(err)
+        raise ProcessorExecuteError(err)
+
+
+def call_or_raise(function, *args):
+    """
+    Helper function to call a test suite function, surfacing any
+    error as a process execution error
+
+    :param function: function to call
+    :param args: positional arguments to pass to the function
+
+    :returns: result of the function
+    """
+
+    try:
+        return function(*args)
+    except Exception as err:
+        LOGGER.error(err)
+        raise ProcessorExecuteError(err)
+
+
+def run_ets(record: dict, fail_on_schema_validation: bool) -> dict:
+    """
+    Helper function to run the ETS, once per distinct record content
+
+    :param record: `dict` of WCMP2 record
+    :param fail_on_schema_validation: whether to stop on failing schema
+                                      validation
+
+    :returns: `dict` of ETS report
+    """
+
+    key = (json.dumps(record, sort_keys=True), fail_on_schema_validation)
+
+    with ETS_CACHE_LOCK:
+        report = ETS_CACHE.get(key)
+        if report is not None:
+            ETS_CACHE.move_to_end(key)
+
+    if report is None:
+        LOGGER.debug('Running ETS against record')
+        report = WMOCoreMetadataProfileTestSuite2(record).run_tests(
+            fail_on_schema_validation=fail_on_schema_validation)
+
+        with ETS_CACHE_LOCK:
+            ETS_CACHE[key] = report
+            if len(ETS_CACHE) > ETS_CACHE_SIZE:
+                ETS_CACHE.popitem(last=False)
+    else:
+        LOGGER.debug('Using previous ETS result for record')
+
+    # each report is a distinct generation event
+    report = deepcopy(report)
+    report['id'] = str(uuid.uuid4())
+    report['datetime'] = get_current_datetime_rfc3339()
+
+    return report
+
 
 class WCMP2ETSProcessor(BaseProcessor):
     """WCMP2 ETS"""
@@ -207,9 +365,9 @@ class WCMP2ETSProcessor(BaseProcessor):
             LOGGER.error(msg)
             raise ProcessorExecuteError(msg)
 
-        LOGGER.debug('Running ETS against record')
-        response = WMOCoreMetadataProfileTestSuite2(record).run_tests(
-            fail_on_schema_validation=fail_on_schema_validation)
+        record = load_record(record)
+
+        response = run_ets(record, fail_on_schema_validation)
 
         return mimetype, response
 
@@ -242,6 +400,8 @@ class WCMP2KPIProcessor(BaseProcessor):
             LOGGER.error(msg)
             raise ProcessorExecuteError(msg)
 
+        record = load_record(record)
+
         LOGGER.debug('Running KPIs against record')
         kpis = WMOCoreMetadataProfileKeyPerformanceIndicators(record)
         response = kpis.evaluate()
@@ -250,3 +410,62 @@ class WCMP2KPIProcessor(BaseProcessor):
 
     def __repr__(self):
         return '<WCMP2KPIProcessor>'
+
+
+class WCMP2ETSKPIProcessor(BaseProcessor):
+    """WCMP2 ETS and KPI"""
+
+    def __init__(self, processor_def):
+        """
+        Initialize object
+
+        :param processor_def: provider definition
+
+        :returns: pywcmp.pygeoapi_plugin.WCMP2ETSKPIProcessor
+        """
+
+        super().__init__(processor_def, PROCESS_WCMP2_ETS_KPI)
+
+    def execute(self, data):
+
+        response = None
+        mimetype = 'application/json'
+        record = data.get('record')
+        fail_on_schema_validation = data.get('fail_on_schema_validation', True)
+
+        if record is None:
+            msg = 'Missing record'
+            LOGGER.error(msg)
+            raise ProcessorExecuteError(msg)
+
+        record = load_record(record)
+
+        # fail fast on a missing schema, before any KPI link checks
+        call_or_raise(get_validator)
+
+        kpis = WMOCoreMetadataProfileKeyPerformanceIndicators(record)
+
+        if fail_on_schema_validation:
+            # the ETS validates the record (once), so a schema-invalid
+            # record fails before any (slow) KPI link checks are started
+            LOGGER.debug('Running ETS, then KPIs against record')
+            ets_result = call_or_raise(run_ets, record, True)
+            kpi_result = call_or_raise(kpis.evaluate)
+        else:
+            LOGGER.debug('Running ETS and KPIs against record concurrently')
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                ets_future = executor.submit(run_ets, record, False)
+                kpi_future = executor.submit(kpis.evaluate)
+
+                ets_result = call_or_raise(ets_future.result)
+                kpi_result = call_or_raise(kpi_future.result)
+
+        response = {
+            'ets': ets_result,
+            'kpi': kpi_result
+        }
+
+        return mimetype, response
+
+    def __repr__(self):
+        return '<WCMP2ETSKPIProcessor>'
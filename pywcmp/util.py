@@ -26,14 +26,18 @@
 #
 ###############################################################################
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 import json
 import logging
 from pathlib import Path
+import re
 import ssl
 import sys
-from urllib.error import URLError
-from urllib.request import urlopen
+import threading
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
 from urllib.parse import urlparse
 
 from spellchecker import SpellChecker
@@ -41,22 +45,72 @@ from spellchecker import SpellChecker
 LOGGER = logging.getLogger(__name__)
 THISDIR = Path(__file__).parent.resolve()
 
+SPELLCHECKER_LOCK = threading.Lock()
 
-def check_spelling(text: str) -> list:
+# maximum number of links checked concurrently
+MAX_LINK_CHECK_WORKERS = 16
+
+# accepted RFC3339 datetimes, e.g. 2024-08-09T14:29:23Z,
+# 2024-08-09T14:29:23.12Z, 2024-08-09T14:29:23+0400 (or +04:00);
+# T and Z may be lowercase (RFC3339 section 5.6)
+CREATED_DATETIME_REGEX = re.compile(
+    r'(?P<datetime>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})'
+    r'(?:(?:\.\d{1,6})?Z|(?P<offset>[+-]\d{2}:?\d{2}))', re.IGNORECASE)
+
+
+def get_spellchecker() -> SpellChecker:
     """
-    Helper function to spell check a string
+    Helper function to get the spell checker, safe for concurrent callers
 
-    :returns: `list` of unknown / misspelled words
+    :returns: `spellchecker.SpellChecker` instance
+    """
+
+    with SPELLCHECKER_LOCK:
+        return load_spellchecker()
+
+
+@lru_cache(maxsize=1)
+def load_spellchecker() -> SpellChecker:
+    """
+    Helper function to load the spell checker and custom dictionary once
+
+    :returns: `spellchecker.SpellChecker` instance
     """
 
-    LOGGER.debug(f'Spellchecking {text}')
     spell = SpellChecker()
 
     dictionary = THISDIR / 'dictionary.txt'
-    LOGGER.debug(f'Loading custom dictionary {dictionary}')
+    LOGGER.debug('Loading custom dictionary %s', dictionary)
     spell.word_frequency.load_text_file(f'{dictionary}')
 
-    return list(spell.unknown(spell.split_words(text)))
+    return spell
+
+
+def check_spelling(text: str) -> list:
+    """
+    Helper function to spell check a string
+
+    :returns: `list` of unknown / misspelled words
+    """
+
+    LOGGER.debug('Spellchecking %s', text)
+    words = (word.lower() for word in get_spellchecker().split_words(text))
+
+    return list(dict.fromkeys(w for w in words if not is_known_word(w)))
+
+
+@lru_cache(maxsize=100000)
+def is_known_word(word: str) -> bool:
+    """
+    Helper function to check whether a (lowercase) word is known,
+    remembering results across documents
+
+    :param word: word to check
+
+    :returns: `bool` of whether the word is known (or not checkable)
+    """
+
+    return not get_spellchecker().unknown([word])
 
 
 def get_cli_common_options(function):
@@ -75,11 +129,12 @@ def get_cli_common_options(function):
     return function
 
 
-def get_userdir() -> str:
+@lru_cache(maxsize=1)
+def get_userdir() -> Path:
     """
-    Helper function to get userdir
+    Helper function to get userdir (once per process)
 
-    :returns: user's home directory
+    :returns: `pathlib.Path` of user's pywcmp directory
     """
 
     return Path.home() / '.pywcmp'
@@ -146,6 +201,40 @@ def urlopen_(url: str):
     return response
 
 
+def urlopen_head(url: str, timeout: int, context=None):
+    """
+    Helper function to open a URL with a HEAD request, falling back to GET
+    for servers that do not support HEAD
+
+    :param url: URL to open
+    :param timeout: timeout, in seconds
+    :param context: `ssl.SSLContext` (optional)
+
+    :returns: `http.client.HTTPResponse` object
+    """
+
+    try:
+        return urlopen(Request(url, method='HEAD'), context=context,
+                       timeout=timeout)
+    except HTTPError as err:
+        if err.code not in (405, 501):
+            raise
+        err.close()
+        LOGGER.debug('HEAD not supported (%s); retrying with GET', err.code)
+        return urlopen(url, context=context, timeout=timeout)
+
+
+@lru_cache(maxsize=1)
+def get_unverified_context() -> ssl.SSLContext:
+    """
+    Helper function to create an unverified SSL context (once per process)
+
+    :returns: `ssl.SSLContext` without certificate verification
+    """
+
+    return ssl._create_unverified_context()
+
+
 def check_url(url: str, check_ssl: bool, timeout: int = 30) -> dict:
     """
     Helper function to check link (URL) accessibility
@@ -163,43 +252,65 @@ def check_url(url: str, check_ssl: bool, timeout: int = 30) -> dict:
         'url-original': url
     }
 
-    try:
-        if not check_ssl:
-            LOGGER.debug('Creating unverified context')
-            result['ssl'] = False
-            context = ssl._create_unverified_context()
-            response = urlopen(url, context=context, timeout=timeout)
-        else:
-            response = urlopen(url, timeout=timeout)
-    except TimeoutError as err:
-        LOGGER.debug(f'Timeout error: {err}')
-    except (ssl.SSLError, URLError, ValueError) as err:
-        LOGGER.debug(f'SSL/URL error: {err}')
-        LOGGER.debug(err)
-    except Exception as err:
-        LOGGER.debug(f'Other error: {err}')
-        LOGGER.debug(err)
-
-    if response is None and check_ssl:
-        return check_url(url, False)
+    # verified first (if requested), then a single unverified fallback
+    verify_modes = (True, False) if check_ssl else (False,)
+
+    for verify in verify_modes:
+        try:
+            if not verify:
+                LOGGER.debug('Using unverified context')
+                result['ssl'] = False
+                response = urlopen_head(url, timeout,
+                                        context=get_unverified_context())
+            else:
+                response = urlopen_head(url, timeout)
+            break
+        except TimeoutError as err:
+            LOGGER.debug('Timeout error: %s', err)
+        except (ssl.SSLError, URLError, ValueError) as err:
+            LOGGER.debug('SSL/URL error: %s', err)
+        except Exception as err:
+            LOGGER.debug('Other error: %s', err)
 
     if response is not None:
         result['url-resolved'] = response.url
         parsed_uri = urlparse(response.url)
         if parsed_uri.scheme in ('http', 'https'):
             if response.status > 300:
-                LOGGER.debug(f'Request failed: {response}')
+                LOGGER.debug('Request failed: %s', response)
             result['accessible'] = response.status < 300
             result['mime-type'] = response.headers.get_content_type()
         else:
             result['accessible'] = True
-        if parsed_uri.scheme in ('https') and check_ssl:
+        if parsed_uri.scheme == 'https' and result.get('ssl') is None:
             result['ssl'] = True
+        response.close()
     else:
         result['accessible'] = False
     return result
 
 
+def check_urls(urls: list, check_ssl: bool,
+               max_workers: int = MAX_LINK_CHECK_WORKERS) -> list:
+    """
+    Helper function to check multiple links (URLs) concurrently
+
+    :param urls: `list` of URLs to check
+    :param check_ssl: Whether the SSL/TLS layer verification shall be made
+    :param max_workers: maximum number of concurrent checks
+                        (default: `MAX_LINK_CHECK_WORKERS`)
+
+    :returns: `list` of `dict` with details about each link, in input order
+    """
+
+    if not urls:
+        return []
+
+    LOGGER.debug('Checking %s links concurrently', len(urls))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda u: check_url(u, check_ssl), urls))
+
+
 def parse_wcmp(content: str) -> dict:
     """
     Parse a string of WCMP into a JSON dict (WCMP2)
@@ -238,18 +349,22 @@ def is_valid_created_datetime(value: str) -> bool:
     :returns: `bool` of whether datetime is valid/acceptable
     """
 
-    datetime_formats = [
-        '%Y-%m-%dT%H:%M:%SZ',     # 2024-08-09T14:29:23Z
-        '%Y-%m-%dT%H:%M:%S.%fZ',  # 2024-08-09T14:29.12Z
-        '%Y-%m-%dT%H:%M:%S%z'     # 2024-08-09T14:29+0400
-    ]
+    match = CREATED_DATETIME_REGEX.fullmatch(value)
 
-    for datetime_format in datetime_formats:
-        try:
-            datetime.strptime(value, datetime_format)
-            return True
-        except ValueError as err:
-            msg = f'datetime {value} invalid against {datetime_format}: {err}'
-            LOGGER.debug(msg)
+    if match is None:
+        LOGGER.debug('datetime %s does not match an accepted format', value)
+        return False
 
-    return False
+    try:
+        # the regular expression checks layout, strptime checks ranges
+        datetime.strptime(match.group('datetime'), '%Y-%m-%dT%H:%M:%S')
+    except ValueError as err:
+        LOGGER.debug('datetime %s invalid: %s', value, err)
+        return False
+
+    offset = match.group('offset')
+    if offset is not None and (int(offset[1:3]) > 23 or int(offset[-2:]) > 59):
+        LOGGER.debug('datetime %s has an invalid UTC offset', value)
+        return False
+
+    return True
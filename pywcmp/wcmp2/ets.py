@@ -26,6 +26,7 @@
 # executable test suite as per WMO Core Metadata Profile 2, Annex A
 
 import csv
+from functools import lru_cache
 import json
 import logging
 from pathlib import Path
@@ -70,13 +71,12 @@ class WMOCoreMetadataProfileTestSuite2:
         self.test_id = None
         self.record = data
 
-        self.th = TopicHierarchy(tables=get_userdir())
+        self.th = get_topic_hierarchy()
 
     def run_tests(self, fail_on_schema_validation=False):
         """Convenience function to run all tests"""
 
         results = []
-        tests = []
         ets_report = {
             'id': str(uuid.uuid4()),
             'report_type': 'ets',
@@ -84,14 +84,6 @@ class WMOCoreMetadataProfileTestSuite2:
             'generated_by': f'pywcmp {pywcmp.__version__} (https://github.com/wmo-im/pywcmp)'  # noqa
         }
 
-        for f in dir(WMOCoreMetadataProfileTestSuite2):
-            if all([
-                    callable(getattr(WMOCoreMetadataProfileTestSuite2, f)),
-                    f.startswith('test_requirement'),
-                    not f.endswith('validation')]):
-
-                tests.append(f)
-
         validation_result = self.test_requirement_validation()
         if validation_result['code'] == 'FAILED':
             if fail_on_schema_validation:
@@ -100,7 +92,7 @@ class WMOCoreMetadataProfileTestSuite2:
                 LOGGER.error(msg)
                 raise ValueError(msg)
 
-        for t in tests:
+        for t in TESTS:
             results.append(getattr(self, t)())
 
         for code in ['PASSED', 'FAILED', 'SKIPPED']:
@@ -125,25 +117,21 @@ class WMOCoreMetadataProfileTestSuite2:
             'code': 'PASSED'
         }
 
-        schema = WCMP2_FILES / 'wcmp2-bundled.json'
-
-        if not schema.exists():
-            msg = "WCMP2 schema missing. Run 'pywcmp bundle sync' to cache"
-            LOGGER.error(msg)
-            raise RuntimeError(msg)
+        validator = get_validator()
 
-        with schema.open() as fh:
-            LOGGER.debug(f'Validating {self.record} against {schema}')
-            validator = Draft202012Validator(json.load(fh))
+        LOGGER.debug('Validating %s against WCMP2 schema', self.record)
+        if validator.is_valid(self.record):
+            LOGGER.debug('Record is valid; no errors to collect')
+            return status
 
-            for error in validator.iter_errors(self.record):
-                LOGGER.debug(f'{error.json_path}: {error.message}')
-                validation_errors.append(f'{error.json_path}: {error.message}')
+        for error in validator.iter_errors(self.record):
+            LOGGER.debug('%s: %s', error.json_path, error.message)
+            validation_errors.append(f'{error.json_path}: {error.message}')
 
-            if validation_errors:
-                status['code'] = 'FAILED'
-                status['message'] = f'{len(validation_errors)} error(s)'
-                status['errors'] = validation_errors
+        if validation_errors:
+            status['code'] = 'FAILED'
+            status['message'] = f'{len(validation_errors)} error(s)'
+            status['errors'] = validation_errors
 
         return status
 
@@ -180,7 +168,7 @@ class WMOCoreMetadataProfileTestSuite2:
         if centre_id.endswith('-test'):
             LOGGER.debug('Test centre-id, no further centre-id testing')
         else:
-            if centre_id not in self.th.topics[3]:
+            if centre_id not in get_topic_level(3):
                 status['code'] = 'FAILED'
                 status['message'] = f'Invalid centre_id: {centre_id}'
                 return status
@@ -216,7 +204,7 @@ class WMOCoreMetadataProfileTestSuite2:
             'code': 'PASSED'
         }
 
-        rt = Path(get_userdir()) / 'wcmp-2' / 'codelists' / 'resource-type.csv'
+        rt = get_userdir() / 'wcmp-2' / 'codelists' / 'resource-type.csv'
         resource_types = get_codelist(rt)
 
         if self.record['properties']['type'] not in resource_types:
@@ -300,6 +288,7 @@ class WMOCoreMetadataProfileTestSuite2:
         }
 
         earth_system_discipline_theme_found = False
+        earth_system_disciplines = get_topic_level(6)
 
         themes = self.record['properties']['themes']
 
@@ -328,6 +317,9 @@ class WMOCoreMetadataProfileTestSuite2:
             if 'earth-system-discipline' in scheme:
                 earth_system_discipline_theme_found = True
 
+            is_earth_system_discipline_scheme = scheme.endswith(
+                'earth-system-discipline')
+
             for c in concepts:
                 cid = c.get('id')
 
@@ -337,8 +329,8 @@ class WMOCoreMetadataProfileTestSuite2:
 
                     return status
 
-                if scheme.endswith('earth-system-discipline'):
-                    if cid not in self.th.topics[6]:
+                if is_earth_system_discipline_scheme:
+                    if cid not in earth_system_disciplines:
                         msg = f'Invalid Earth system discipline {cid}'
 
                         status['code'] = 'FAILED'
@@ -366,7 +358,7 @@ class WMOCoreMetadataProfileTestSuite2:
             'code': 'PASSED'
         }
 
-        cr = Path(get_userdir()) / 'wcmp-2' / 'codelists' / 'contact-role.csv'
+        cr = get_userdir() / 'wcmp-2' / 'codelists' / 'contact-role.csv'
         contact_role_types = get_codelist(cr)
 
         for c in self.record['properties']['contacts']:
@@ -415,7 +407,7 @@ class WMOCoreMetadataProfileTestSuite2:
 
             data_policy = self.record['properties']['wmo:dataPolicy']
 
-            if data_policy not in self.th.topics[5]:
+            if data_policy not in get_topic_level(5):
                 status['code'] = 'FAILED'
                 status['message'] = f'Invalid data policy {data_policy}'
                 return status
@@ -482,41 +474,92 @@ class WMOCoreMetadataProfileTestSuite2:
         return status
 
 
-def get_codelist(filepath: Path) -> list:
+# all test method names (except schema validation, which is run first),
+# as discovered once at import time
+TESTS = tuple(
+    f for f in dir(WMOCoreMetadataProfileTestSuite2)
+    if all([callable(getattr(WMOCoreMetadataProfileTestSuite2, f)),
+            f.startswith('test_requirement'),
+            not f.endswith('validation')])
+)
+
+
+@lru_cache(maxsize=1)
+def get_validator() -> Draft202012Validator:
     """
-    Helper function to derive WCMP2 codelist
+    Helper function to load the WCMP2 schema validator (once per process)
 
+    :returns: `jsonschema.validators.Draft202012Validator`
+    """
 
-    :param filepath: `Path` of CSV file
-    :returns: `list` of all codelist 'Name' columns
+    schema = WCMP2_FILES / 'wcmp2-bundled.json'
+
+    if not schema.exists():
+        msg = "WCMP2 schema missing. Run 'pywcmp bundle sync' to cache"
+        LOGGER.error(msg)
+        raise RuntimeError(msg)
+
+    with schema.open() as fh:
+        LOGGER.debug('Loading WCMP2 schema %s', schema)
+        return Draft202012Validator(json.load(fh))
+
+
+@lru_cache(maxsize=1)
+def get_topic_hierarchy() -> TopicHierarchy:
     """
+    Helper function to load the WIS2 topic hierarchy (once per process)
 
-    names = []
+    :returns: `pywis_topics.topics.TopicHierarchy`
+    """
+
+    LOGGER.debug('Loading WIS2 topic hierarchy')
+    return TopicHierarchy(tables=get_userdir())
+
+
+@lru_cache(maxsize=None)
+def get_topic_level(level: int) -> frozenset:
+    """
+    Helper function to derive all topics of a WIS2 topic hierarchy level
+
+    :param level: `int` of topic hierarchy level (0 is the channel)
+
+    :returns: `frozenset` of topics at the given level
+    """
+
+    return frozenset(get_topic_hierarchy().topics[level])
+
+
+@lru_cache(maxsize=None)
+def get_codelist(filepath: Path) -> frozenset:
+    """
+    Helper function to derive WCMP2 codelist (read once per process)
+
+
+    :param filepath: `Path` of CSV file
+    :returns: `frozenset` of all codelist 'Name' columns
+    """
 
     if not filepath.exists():
         msg = f'File {filepath} missing. Run "pywcmp bundle sync"'
         LOGGER.error(msg)
         raise RuntimeError(msg)
 
-    with filepath.open() as fh:
-        LOGGER.debug(f'Reading codelist file {fh}')
-        reader = csv.reader(fh)
-        for row in reader:
-            names.append(row[0])
+    LOGGER.debug('Reading codelist file %s', filepath)
+    reader = csv.reader(filepath.read_text().splitlines(keepends=True))
 
-    return names
+    return frozenset(row[0] for row in reader)
 
 
-def get_link_relations() -> list:
+def get_link_relations() -> frozenset:
     """
-    Helper function to derive combined list of required link relations:
+    Helper function to derive combined set of required link relations:
     - IANA
     - WCMP2 codelists
 
-    :returns: `list` of all required link relations
+    :returns: `frozenset` of all required link relations
     """
 
-    lr = Path(get_userdir()) / 'wcmp-2' / 'link-relations-1.csv'
-    lt = Path(get_userdir()) / 'wcmp-2' / 'codelists' / 'link-type.csv'
+    lr = get_userdir() / 'wcmp-2' / 'link-relations-1.csv'
+    lt = get_userdir() / 'wcmp-2' / 'codelists' / 'link-type.csv'
 
-    return get_codelist(lr) + get_codelist(lt)
+    return get_codelist(lr) | get_codelist(lt)
@@ -25,22 +25,45 @@
 
 # WMO Core Metadata Profile Key Performance Indicators (KPIs)
 
+from bisect import bisect_right
 import logging
 import mimetypes
 import re
 import uuid
 
-from bs4 import BeautifulSoup
-
 import pywcmp
-from pywcmp.util import (check_spelling, check_url,
-                         get_current_datetime_rfc3339)
+from pywcmp.util import (check_spelling, check_url, check_urls,
+                         get_current_datetime_rfc3339, MAX_LINK_CHECK_WORKERS)
 
 LOGGER = logging.getLogger(__name__)
 
 # round percentages to x decimal places
 ROUND = 3
 
+# letter grades and the minimum percentages to achieve them
+GRADES = ('F', 'E', 'D', 'C', 'B', 'A')
+GRADE_THRESHOLDS = (20, 35, 50, 65, 80)
+
+ACRONYM_REGEX = re.compile(r'\b([A-Z]{2,}\d*)\b')
+BULLETIN_HEADER_REGEX = re.compile(r'[A-Z]{4}\d{2}[\s_]*[A-Z]{4}')
+HTML_TAG_REGEX = re.compile(r'<[a-zA-Z][^<>]*>')
+
+WEB_IMAGE_MIME_TYPES = frozenset([
+    'image/apng',
+    'image/avif',
+    'image/gif',
+    'image/jpeg',
+    'image/png',
+    'image/svg+xml',
+    'image/webp'
+])
+
+VALID_LINK_MIME_TYPES = frozenset(mimetypes.types_map.values()) | {
+    'application/bufr',
+    'application/grib',
+    'text/turtle'
+}
+
 
 def gen_test_id(test_id: str) -> str:
     """
@@ -57,17 +80,22 @@ def gen_test_id(test_id: str) -> str:
 class WMOCoreMetadataProfileKeyPerformanceIndicators:
     """Key Performance Indicators for WMO Core Metadata Profile"""
 
-    def __init__(self, data):
+    def __init__(self, data, fast_mode=False):
         """
         initializer
 
         :param data: dict of WCMP JSON
+        :param fast_mode: whether to skip the remaining (expensive) checks
+                          of a KPI once its basic checks have mostly failed
 
         :returns: `pywcmp.wcmp2.kpi.WMOCoreMetadataProfileKeyPerformanceIndicators`  # noqa
         """
 
         self.data = data
+        self.fast_mode = fast_mode
         self.codelists = None
+        self.checked_links = {}
+        self.kpi_results = {}
 
     @property
     def identifier(self):
@@ -79,6 +107,20 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
 
         return self.data['id']
 
+    def check_link(self, url: str) -> dict:
+        """
+        Helper function to check a link, once per URL for a given record
+
+        :param url: URL to check
+
+        :returns: `dict` with details about the link
+        """
+
+        if url not in self.checked_links:
+            self.checked_links[url] = check_url(url, False)
+
+        return self.checked_links[url]
+
     def kpi_title(self) -> tuple:
         """
         Implements KPI for Good quality title
@@ -93,9 +135,8 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
 
         id_ = gen_test_id('good_quality_title')
         title = 'Good quality title'
-        acronym_regex = r'\b([A-Z]{2,}\d*)\b'
 
-        LOGGER.info(f'Running {title}')
+        LOGGER.info('Running %s', title)
 
         title = self.data['properties']['title']
 
@@ -110,9 +151,6 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
             LOGGER.debug(err)
             return
 
-        title_words = title.split()
-
-        LOGGER.debug('Testing number of words')
         if len(title_words) >= 3:
             score += 1
         else:
@@ -130,8 +168,14 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
         else:
             comments.append('Title contains non-printable characters')
 
+        if self.fast_mode and score < 3:
+            LOGGER.debug('Title fails basic checks; skipping remaining checks')
+            comments.append('Fast mode: remaining checks skipped')
+            return id_, title, total, score, comments
+
         LOGGER.debug('Testing for sentence case')
-        title2 = re.sub(acronym_regex, '', title).strip()
+        title2, acronyms_count = ACRONYM_REGEX.subn('', title)
+        title2 = title2.strip()
         if title2.capitalize() == title2:
             score += 1
         else:
@@ -139,13 +183,13 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
 
         LOGGER.debug('Testing for acronyms')
 
-        if len(re.findall(acronym_regex, title)) <= 3:
+        if acronyms_count <= 3:
             score += 1
         else:
             comments.append('Title has more than 3 acronyms')
 
         LOGGER.debug('Testing for bulletin headers')
-        has_bulletin_header = re.search(r'[A-Z]{4}\d{2}[\s_]*[A-Z]{4}', title)
+        has_bulletin_header = BULLETIN_HEADER_REGEX.search(title)
         if not has_bulletin_header:
             score += 1
         else:
@@ -177,7 +221,7 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
         id_ = gen_test_id('good_quality_description')
         title = ': Good quality description'
 
-        LOGGER.info(f'Running {title}')
+        LOGGER.info('Running %s', title)
 
         description = self.data['properties']['description']
 
@@ -193,13 +237,18 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
             comments.append('Description is not between 16 and 2048 characters')  # noqa
 
         LOGGER.debug('Testing for HTML detection')
-        if not bool(BeautifulSoup(description, "html.parser").find()):
+        if HTML_TAG_REGEX.search(description) is None:
             score += 1
         else:
             comments.append('Description contains markup')
 
+        if self.fast_mode and score < 1:
+            LOGGER.debug('Description fails basic checks; skipping remaining checks')  # noqa
+            comments.append('Fast mode: remaining checks skipped')
+            return id_, title, total, score, comments
+
         LOGGER.debug('Testing for bulletin headers')
-        has_bulletin_header = re.search(r'[A-Z]{4}\d{2}[\s_]*[A-Z]{4}', description)  # noqa
+        has_bulletin_header = BULLETIN_HEADER_REGEX.search(description)
         if not has_bulletin_header:
             score += 1
         else:
@@ -232,7 +281,7 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
         id_ = gen_test_id('time_intervals')
         title = 'Time intervals'
 
-        LOGGER.info(f'Running {title}')
+        LOGGER.info('Running %s', title)
 
         time_ = self.data.get('time')
         if time_ is None:
@@ -240,17 +289,14 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
             LOGGER.debug(msg)
             return id_, title, 0, 0, [msg]
 
-        interval = self.data['time'].get('interval')
+        if time_.get('interval') is not None:
+            time_intervals.append(time_)
 
-        if interval is not None:
-            time_intervals.append(self.data['time'])
+        additional_extents = self.data.get('additionalExtents') or {}
+        temporal = additional_extents.get('temporal') or {}
 
-        try:
-            if self.data['additionalExtents']['temporal']['interval'] is not None:  # noqa
-                time_intervals.append(
-                    self.data['additionalExtents']['temporal'])
-        except KeyError:
-            pass
+        if temporal.get('interval') is not None:
+            time_intervals.append(temporal)
 
         for time_interval in time_intervals:
             total += 3
@@ -288,20 +334,10 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
         score = 0
         comments = []
 
-        web_image_mime_types = [
-            'image/apng',
-            'image/avif',
-            'image/gif',
-            'image/jpeg',
-            'image/png',
-            'image/svg+xml',
-            'image/webp'
-        ]
-
         id_ = gen_test_id('graphic_overview_for_metadata_records')
         title = 'Graphic overview for metadata records'
 
-        LOGGER.info(f'Running {title}')
+        LOGGER.info('Running %s', title)
 
         for link in self.data['links']:
             if link.get('rel') == 'preview':
@@ -310,11 +346,11 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
                 total += 3
                 score += 1
 
-                result = check_url(link['href'], False)
+                result = self.check_link(link['href'])
 
                 LOGGER.debug('Testing whether link is a web image file type')
                 mime_type = link.get('type', '')
-                if mime_type in web_image_mime_types and result['mime-type'] in web_image_mime_types:  # noqa
+                if mime_type in WEB_IMAGE_MIME_TYPES and result['mime-type'] in WEB_IMAGE_MIME_TYPES:  # noqa
                     score += 1
                 else:
                     comments.append(f'MIME type {mime_type} not a web image')
@@ -344,14 +380,7 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
         id_ = gen_test_id('links_health')
         title = 'Links health'
 
-        valid_link_mime_types = list(mimetypes.types_map.values())
-        valid_link_mime_types.extend([
-            'application/bufr',
-            'application/grib',
-            'text/turtle'
-        ])
-
-        LOGGER.info(f'Running {title}')
+        LOGGER.info('Running %s', title)
 
         LOGGER.debug('Assembling all links')
 
@@ -373,34 +402,44 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
                     'href': link['href']
                 })
 
+        http_links = []
+
         for link in links:
-            LOGGER.debug(f'Checking link: {link}')
+            LOGGER.debug('Checking link: %s', link)
             if link.get('href') is None:
-                LOGGER.debug(f"URL is not a proper URL: {link['href']}")
+                LOGGER.debug('URL is not a proper URL: %s', link['href'])
                 continue
 
             if link.get('href', '').startswith('http'):
-                total += 2
+                http_links.append(link)
 
-                LOGGER.debug('Testing whether link resolves successfully')
-                result = check_url(link['href'], False)
+        unique_urls = dict.fromkeys(link['href'] for link in http_links)
+        urls = [url for url in unique_urls if url not in self.checked_links]
 
-                if result['accessible']:
-                    score += 1
-                else:
-                    comments.append(f"URL not accessible: {link['href']}")
+        self.checked_links.update(
+            zip(urls, check_urls(urls, False, MAX_LINK_CHECK_WORKERS)))
+
+        for link in http_links:
+            total += 2
+            result = self.checked_links[link['href']]
 
-                LOGGER.debug('Checking whether link has a valid media type')
-                link_type = link.get('type')
+            LOGGER.debug('Testing whether link resolves successfully')
+            if result['accessible']:
+                score += 1
+            else:
+                comments.append(f"URL not accessible: {link['href']}")
 
-                if link_type is None:
-                    LOGGER.debug('Deriving link type from HTTP Content-Type')
-                    link_type = result.get('mime-type')
+            LOGGER.debug('Checking whether link has a valid media type')
+            link_type = link.get('type')
 
-                if link_type in valid_link_mime_types:
-                    score += 1
-                else:
-                    comments.append(f"invalid link type {link_type}")
+            if link_type is None:
+                LOGGER.debug('Deriving link type from HTTP Content-Type')
+                link_type = result.get('mime-type')
+
+            if link_type in VALID_LINK_MIME_TYPES:
+                score += 1
+            else:
+                comments.append(f"invalid link type {link_type}")
 
         return id_, title, total, score, comments
 
@@ -422,7 +461,7 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
         id_ = gen_test_id('contacts')
         title = 'Contacts'
 
-        LOGGER.info(f'Running {title}')
+        LOGGER.info('Running %s', title)
 
         for contact in self.data['properties']['contacts']:
             if 'host' in contact['roles']:
@@ -467,7 +506,7 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
         id_ = gen_test_id('persistent_identifiers')
         title = 'Persistent identifiers'
 
-        LOGGER.info(f'Running {title}')
+        LOGGER.info('Running %s', title)
 
         if 'externalIds' in self.data['properties']:
             total = 3
@@ -498,14 +537,7 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
         :returns: `dict` of overall test report
         """
 
-        kpis_to_run = []
-
-        for f in dir(WMOCoreMetadataProfileKeyPerformanceIndicators):
-            if all([
-                    callable(getattr(WMOCoreMetadataProfileKeyPerformanceIndicators, f)),  # noqa
-                    f.startswith('kpi_')]):
-
-                kpis_to_run.append(f)
+        kpis_to_run = list(KPIS)
 
         if kpi is not None:
             selected_kpi = f'kpi_{kpi}'
@@ -516,7 +548,7 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
             else:
                 kpis_to_run = [selected_kpi]
 
-        LOGGER.info(f'Evaluating KPIs: {kpis_to_run}')
+        LOGGER.info('Evaluating KPIs: %s', kpis_to_run)
 
         results = {
             'id': str(uuid.uuid4()),
@@ -528,9 +560,14 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
         }
 
         for kpi in kpis_to_run:
-            LOGGER.debug(f'Running {kpi}')
-            result = getattr(self, kpi)()
-            LOGGER.debug(f'Raw result: {result}')
+            if kpi not in self.kpi_results:
+                LOGGER.debug('Running %s', kpi)
+                self.kpi_results[kpi] = getattr(self, kpi)()
+            else:
+                LOGGER.debug('Using previous result of %s', kpi)
+
+            result = self.kpi_results[kpi]
+            LOGGER.debug('Raw result: %s', result)
             LOGGER.debug('Calculating result')
             try:
                 percentage = round(float((result[3] / result[2]) * 100), ROUND)
@@ -545,7 +582,8 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
                 'comments': result[4],
                 'percentage': percentage
             })
-            LOGGER.debug(f'{kpi}: {result[2]} / {result[3]} = {percentage}')
+            LOGGER.debug('%s: %s / %s = %s', kpi, result[2], result[3],
+                         percentage)
 
         LOGGER.debug('Calculating total results')
         results['summary'] = generate_summary(results)
@@ -557,6 +595,14 @@ class WMOCoreMetadataProfileKeyPerformanceIndicators:
         return results
 
 
+# all KPI method names, as discovered once at import time
+KPIS = tuple(
+    f for f in dir(WMOCoreMetadataProfileKeyPerformanceIndicators)
+    if all([callable(getattr(WMOCoreMetadataProfileKeyPerformanceIndicators, f)),  # noqa
+            f.startswith('kpi_')])
+)
+
+
 def generate_summary(results: dict) -> dict:
     """
     Generates a summary entry for given group of results
@@ -566,14 +612,15 @@ def generate_summary(results: dict) -> dict:
     :returns: `dict` of summary report
     """
 
-    sum_total = sum(v['total'] for v in results['tests'])
-    sum_score = sum(v['score'] for v in results['tests'])
+    sum_total = 0
+    sum_score = 0
     comments = {}
 
     for test in results['tests']:
-        if test['comments']:
-            for k, v in test.items():
-                comments[k] = v
+        sum_total += test['total']
+        sum_score += test['score']
+        if (test_comments := test['comments']):
+            comments[test['id']] = test_comments
 
     try:
         sum_percentage = round(float((sum_score / sum_total) * 100), ROUND)
@@ -600,20 +647,9 @@ def calculate_grade(percentage: float) -> str:
     """
 
     if percentage is None:
-        grade = None
-    elif percentage > 100 or percentage < 0:
+        return None
+
+    if percentage > 100 or percentage < 0:
         raise ValueError('Invalid percentage')
-    elif percentage >= 80:
-        grade = 'A'
-    elif percentage >= 65:
-        grade = 'B'
-    elif percentage >= 50:
-        grade = 'C'
-    elif percentage >= 35:
-        grade = 'D'
-    elif percentage >= 20:
-        grade = 'E'
-    else:
-        grade = percentage
-
-    return grade
+
+    return GRADES[bisect_right(GRADE_THRESHOLDS, percentage)]
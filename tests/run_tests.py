@@ -26,14 +26,22 @@
 #
 ###############################################################################
 
+from http.server import BaseHTTPRequestHandler, HTTPServer
 import json
 import os
+import threading
+import time
 import unittest
 
+from click.testing import CliRunner
+
 from pywcmp.ets import WMOCoreMetadataProfileTestSuite2
+from pywcmp.kpi import validate_batch
 from pywcmp.wcmp2.kpi import (
-    calculate_grade, WMOCoreMetadataProfileKeyPerformanceIndicators)
-from pywcmp.util import is_valid_created_datetime, parse_wcmp
+    calculate_grade, generate_summary, HTML_TAG_REGEX,
+    WMOCoreMetadataProfileKeyPerformanceIndicators)
+from pywcmp.util import (check_url, check_urls, is_valid_created_datetime,
+                         parse_wcmp)
 
 
 def get_test_file_path(filename):
@@ -210,6 +218,92 @@ class WCMP2KPITest(unittest.TestCase):
         self.assertEqual(results['summary']['percentage'], 100)
         self.assertEqual(results['summary']['grade'], 'A')
 
+    def test_kpi_fast_mode(self):
+        """Tests for skipping remaining KPI checks in fast mode"""
+
+        data = {
+            'id': 'urn:wmo:md:ca-eccc-msc:test',
+            'properties': {
+                'title': 'ABCD01_EFGH!'
+            }
+        }
+
+        kpis = WMOCoreMetadataProfileKeyPerformanceIndicators(data)
+        result = kpis.kpi_title()
+        self.assertNotIn('Fast mode: remaining checks skipped', result[4])
+
+        kpis = WMOCoreMetadataProfileKeyPerformanceIndicators(
+            data, fast_mode=True)
+        result = kpis.kpi_title()
+        self.assertEqual(result[3], 2)
+        self.assertIn('Fast mode: remaining checks skipped', result[4])
+
+    def test_kpi_description_markup(self):
+        """Tests for markup detection in descriptions"""
+
+        for description in ['Hourly <b>surface</b> observations',
+                            'Hourly surface observations<br/>',
+                            'Hourly <a href="https://example.org">data</a>']:
+            data = {'properties': {'description': description}}
+            kpis = WMOCoreMetadataProfileKeyPerformanceIndicators(data)
+            self.assertIn('Description contains markup',
+                          kpis.kpi_description()[4])
+
+        for description in ['Hourly surface observations',
+                            'Temperature values where 1 < 2 and 3 > 2',
+                            'Observations <!-- not a tag --> only',
+                            'Stray closing tag </p> only']:
+            data = {'properties': {'description': description}}
+            kpis = WMOCoreMetadataProfileKeyPerformanceIndicators(data)
+            self.assertNotIn('Description contains markup',
+                             kpis.kpi_description()[4])
+
+        # many unterminated tag starts must not scan quadratically
+        start = time.perf_counter()
+        self.assertIsNone(HTML_TAG_REGEX.search('<a' * 50000))
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_generate_summary(self):
+        """Tests for KPI summary generation"""
+
+        results = {
+            'tests': [{
+                'id': 'kpi1',
+                'total': 4,
+                'score': 4,
+                'comments': []
+            }, {
+                'id': 'kpi2',
+                'total': 6,
+                'score': 3,
+                'comments': ['comment']
+            }]
+        }
+
+        summary = generate_summary(results)
+
+        self.assertEqual(summary['total'], 10)
+        self.assertEqual(summary['score'], 7)
+        self.assertEqual(summary['percentage'], 70)
+        self.assertEqual(summary['comments'], {'kpi2': ['comment']})
+
+        summary = generate_summary({'tests': []})
+        self.assertIsNone(summary['percentage'])
+
+    def test_kpi_validate_batch(self):
+        """Tests for batch KPI evaluation of an unparseable file"""
+
+        file_ = get_test_file_path('data/not-json.csv')
+
+        result = CliRunner().invoke(
+            validate_batch, [file_, '--no-fail-on-ets'])
+
+        self.assertEqual(result.exit_code, 1)
+
+        report = json.loads(result.output.split('\n', 1)[1])
+        self.assertEqual(list(report), [file_])
+        self.assertIn('Encoding error', report[file_]['error'])
+
     def test_calculate_grade(self):
         self.assertEqual(calculate_grade(98), 'A')
         self.assertEqual(calculate_grade(77), 'B')
@@ -217,6 +311,9 @@ class WCMP2KPITest(unittest.TestCase):
         self.assertEqual(calculate_grade(52), 'C')
         self.assertEqual(calculate_grade(41), 'D')
         self.assertEqual(calculate_grade(33), 'E')
+        self.assertEqual(calculate_grade(20), 'E')
+        self.assertEqual(calculate_grade(12), 'F')
+        self.assertEqual(calculate_grade(100), 'A')
         self.assertIsNone(calculate_grade(None))
 
         with self.assertRaises(ValueError):
@@ -253,6 +350,103 @@ class WCMPUtilTest(unittest.TestCase):
         self.assertTrue(is_valid_created_datetime('2024-08-09T14:29:22.12Z'))
         self.assertTrue(is_valid_created_datetime('2024-08-09T14:29:22+0400'))
         self.assertTrue(is_valid_created_datetime('2024-08-09T14:29:22+04:00'))
+        self.assertTrue(is_valid_created_datetime('2024-08-09t14:29:22Z'))
+        self.assertTrue(is_valid_created_datetime('2024-08-09T14:29:22z'))
+
+        self.assertFalse(is_valid_created_datetime('None'))
+        self.assertFalse(is_valid_created_datetime('2024-08-09'))
+        self.assertFalse(is_valid_created_datetime('2024-02-30T14:29:22Z'))
+        self.assertFalse(is_valid_created_datetime('2024-08-09T14:29:22'))
+        self.assertFalse(is_valid_created_datetime('2024-08-09T14:29:22Z\n'))
+        self.assertFalse(
+            is_valid_created_datetime('2024-08-09T14:29:22+04:00\n'))
+
+
+class LinkCheckHandler(BaseHTTPRequestHandler):
+    """HTTP handler serving link check test fixtures"""
+
+    methods = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self.methods.append(('HEAD', self.path))
+        if self.path == '/no-head':
+            self.send_response(405)
+        elif self.path == '/forbidden':
+            self.send_response(403)
+        else:
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/png')
+        self.end_headers()
+
+    def do_GET(self):
+        self.methods.append(('GET', self.path))
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.end_headers()
+        self.wfile.write(b'<html></html>')
+
+
+class WCMPLinkCheckTest(unittest.TestCase):
+    """WCMP link check tests"""
+
+    @classmethod
+    def setUpClass(cls):
+        """start local HTTP server"""
+
+        cls.server = HTTPServer(('127.0.0.1', 0), LinkCheckHandler)
+        cls.url = f'http://127.0.0.1:{cls.server.server_port}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """stop local HTTP server"""
+
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """setup test fixtures, etc."""
+        LinkCheckHandler.methods.clear()
+
+    def test_check_url_head(self):
+        """test link check with a HEAD request"""
+
+        result = check_url(f'{self.url}/ok', False)
+
+        self.assertTrue(result['accessible'])
+        self.assertFalse(result['ssl'])
+        self.assertEqual(result['mime-type'], 'image/png')
+        self.assertEqual(LinkCheckHandler.methods, [('HEAD', '/ok')])
+
+    def test_check_url_get_fallback(self):
+        """test link check falling back to GET when HEAD is not allowed"""
+
+        result = check_url(f'{self.url}/no-head', False)
+
+        self.assertTrue(result['accessible'])
+        self.assertEqual(result['mime-type'], 'text/html')
+        self.assertEqual(LinkCheckHandler.methods,
+                         [('HEAD', '/no-head'), ('GET', '/no-head')])
+
+        result = check_url(f'{self.url}/forbidden', False)
+        self.assertFalse(result['accessible'])
+        self.assertNotIn(('GET', '/forbidden'), LinkCheckHandler.methods)
+
+    def test_check_urls(self):
+        """test concurrent link checks keep input order"""
+
+        urls = [f'{self.url}/{i}' for i in range(10)] + [
+            f'{self.url}/forbidden']
+
+        results = check_urls(urls, False, max_workers=4)
+
+        self.assertEqual([r['url-original'] for r in results], urls)
+        self.assertTrue(all(r['accessible'] for r in results[:-1]))
+        self.assertFalse(results[-1]['accessible'])
+        self.assertEqual(check_urls([], False), [])
 
 
 if __name__ == '__main__':